@@ -13,6 +13,9 @@ Press 'q' or ESC to quit.
 """
 
 import sys
+import heapq
+import math
+import queue
 import time
 from collections import deque
 
@@ -34,53 +37,152 @@ try:
     HAS_WEBSOCKETS = True
 except Exception:
     HAS_WEBSOCKETS = False
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+
+# fingers compared against the thumb for pinch detection (order matches 'finger_dists')
+PINCH_FINGERS = ('index', 'middle', 'ring', 'pinky')
+# landmark index pairs measured per hand: each fingertip -> thumb tip, then middle tip -> wrist
+DIST_FROM_IDX = np.array([8, 12, 16, 20, 12])
+DIST_TO_IDX = np.array([4, 4, 4, 4, 0])
+# fingertip-to-thumb distance (fraction of frame diagonal) below which a finger counts as pinched
+PINCH_THRESH = 0.05
+# fallback fingertip candidates must be more than 25px apart; compared squared to skip the sqrt
+TIP_MIN_DIST_SQ = 25 * 25
+# long edge (pixels) of the downscaled copy MediaPipe runs detection on
+DETECT_LONG_EDGE = 480
+# run MediaPipe inference on every Nth frame; frames in between extrapolate the last landmarks
+DETECT_EVERY = 2
+# skipped frames are not extrapolated if a hand's wrist moved further than this (fraction of
+# frame diagonal) between the two snapshots; such jumps are usually mis-paired hands
+MAX_PREDICT_JUMP = 0.1
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def hand_dists(arr):
+        # pixel distances for the DIST_FROM_IDX -> DIST_TO_IDX landmark pairs, compiled to a flat loop
+        out = np.empty(DIST_FROM_IDX.shape[0])
+        for k in range(DIST_FROM_IDX.shape[0]):
+            dx = float(arr[DIST_FROM_IDX[k], 0] - arr[DIST_TO_IDX[k], 0])
+            dy = float(arr[DIST_FROM_IDX[k], 1] - arr[DIST_TO_IDX[k], 1])
+            out[k] = math.sqrt(dx*dx + dy*dy)
+        return out
+else:
+    def hand_dists(arr):
+        # pixel distances for the DIST_FROM_IDX -> DIST_TO_IDX landmark pairs
+        return np.linalg.norm(arr[DIST_FROM_IDX] - arr[DIST_TO_IDX], axis=1)
+
+
+def dumps(obj):
+    # orjson is a much faster encoder when installed; decode so clients still get text frames
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
 class MediaPipeHandTracker:
-    def __init__(self, max_num_hands=2, min_detection_confidence=0.6, min_tracking_confidence=0.5):
+    def __init__(self, max_num_hands=2, min_detection_confidence=0.6, min_tracking_confidence=0.5, model_complexity=0):
         self.mp_hands = mp.solutions.hands
+        # static_image_mode=False lets MediaPipe track between frames and skip re-detection;
+        # model_complexity=0 selects the lighter landmark model (default 1 is the full one)
         self.hands = self.mp_hands.Hands(static_image_mode=False,
                                          max_num_hands=max_num_hands,
+                                         model_complexity=model_complexity,
                                          min_detection_confidence=min_detection_confidence,
                                          min_tracking_confidence=min_tracking_confidence)
         self.mp_draw = mp.solutions.drawing_utils
+        # last two landmark snapshots (int32 (21, 2) arrays per hand) for extrapolating skipped frames
+        self._prev_arrs = []
+        self._last_arrs = []
+        self._last_diag = 1.0
+        # reused RGB conversion buffer (MediaPipe only reads it during the synchronous process call)
+        self._rgb = None
+        # compile the numba kernel now rather than stalling on the first detected hand
+        hand_dists(np.zeros((21, 2), dtype=np.int32))
+
+    def _hand_info(self, arr, frame_diag):
+        pts = [tuple(p) for p in arr.tolist()]
+        # one pass: index/middle/ring/pinky -> thumb, then wrist -> middle tip (hand size)
+        dists = hand_dists(arr)
+        info = {}
+        info['detected'] = True
+        info['landmarks'] = pts
+        info['thumb_tip'] = pts[4]
+        info['index_tip'] = pts[8]
+        info['fingertips'] = [pts[i] for i in (4, 8, 12, 16, 20)]
+        info['fingertips_named'] = {
+            'thumb': pts[4],
+            'index': pts[8],
+            'middle': pts[12],
+            'ring': pts[16],
+            'pinky': pts[20]
+        }
+        info['center'] = (int((pts[0][0] + pts[9][0]) / 2), int((pts[0][1] + pts[9][1]) / 2))
+        info['finger_dists'] = dists[:4]
+        info['distance_index_thumb'] = float(dists[0])
+        # hand size/distance from camera using wrist to middle finger tip distance
+        info['hand_size_norm'] = float(dists[4]) / frame_diag
+        return info
 
-    def process(self, frame):
+    def process(self, frame, disp_size=None):
         # Returns a list of hand infos (one per detected hand)
-        h, w, _ = frame.shape
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb)
+        # disp_size=(w, h) is the display resolution landmarks are mapped to (frame may be a
+        # downscaled copy); callers pass their cached size so the shape isn't re-read per frame
+        if disp_size is not None:
+            w, h = disp_size
+        else:
+            h, w = frame.shape[:2]
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        results = self.hands.process(self._rgb)
         hands_out = []
+        arrs = []
+        # Normalize by frame diagonal for consistent scaling
+        frame_diag = (w*w + h*h) ** 0.5
         if results.multi_hand_landmarks:
             for lm in results.multi_hand_landmarks:
-                pts = [(int(l.x * w), int(l.y * h)) for l in lm.landmark]
-                info = {}
-                info['detected'] = True
-                info['landmarks'] = pts
-                info['thumb_tip'] = pts[4]
-                info['index_tip'] = pts[8]
-                info['fingertips'] = [pts[i] for i in (4, 8, 12, 16, 20)]
-                info['fingertips_named'] = {
-                    'thumb': pts[4],
-                    'index': pts[8],
-                    'middle': pts[12],
-                    'ring': pts[16],
-                    'pinky': pts[20]
-                }
-                info['center'] = (int((pts[0][0] + pts[9][0]) / 2), int((pts[0][1] + pts[9][1]) / 2))
-                dx = info['index_tip'][0] - info['thumb_tip'][0]
-                dy = info['index_tip'][1] - info['thumb_tip'][1]
-                info['distance_index_thumb'] = float((dx*dx + dy*dy) ** 0.5)
-                # Calculate hand size/distance from camera using wrist to middle finger tip distance
-                wrist = pts[0]  # wrist landmark
-                middle_tip = pts[12]  # middle finger tip
-                hand_size_dx = middle_tip[0] - wrist[0]
-                hand_size_dy = middle_tip[1] - wrist[1]
-                hand_size_pixels = float((hand_size_dx*hand_size_dx + hand_size_dy*hand_size_dy) ** 0.5)
-                # Normalize by frame diagonal for consistent scaling
-                frame_diag = (w*w + h*h) ** 0.5
-                info['hand_size_norm'] = hand_size_pixels / frame_diag
-                hands_out.append(info)
+                arr = np.fromiter((v for l in lm.landmark for v in (l.x, l.y)), dtype=np.float32, count=42).reshape(21, 2)
+                arr *= (w, h)
+                arr = arr.astype(np.int32)
+                arrs.append(arr)
+                hands_out.append(self._hand_info(arr, frame_diag))
+        self._prev_arrs = self._last_arrs
+        self._last_arrs = arrs
+        self._last_diag = frame_diag
+        return hands_out
+
+    def predict(self, step):
+        """Hands for a frame that skipped inference.
+        Linearly extrapolates the last landmarks by `step` times the motion between the
+        previous two snapshots; falls back to the last result if the hand count changed or
+        the hands can't be paired up reliably.
+        """
+        # every call builds new dicts; the ones already returned belong to the main thread now
+        if not self._last_arrs or len(self._prev_arrs) != len(self._last_arrs):
+            return [self._hand_info(arr, self._last_diag) for arr in self._last_arrs]
+        # MediaPipe's hand order is not stable between detections, so pair by nearest wrist
+        last_wrists = np.array([a[0] for a in self._last_arrs], dtype=np.float64)
+        prev_wrists = np.array([a[0] for a in self._prev_arrs], dtype=np.float64)
+        d = np.linalg.norm(last_wrists[:, None, :] - prev_wrists[None, :, :], axis=2)
+        match = d.argmin(axis=1)
+        if (len(set(match.tolist())) != len(match)
+                or d[np.arange(len(match)), match].max() > MAX_PREDICT_JUMP * self._last_diag):
+            return [self._hand_info(arr, self._last_diag) for arr in self._last_arrs]
+        hands_out = []
+        for last, j in zip(self._last_arrs, match.tolist()):
+            prev = self._prev_arrs[j]
+            arr = last + ((last - prev) * step).astype(np.int32)
+            hands_out.append(self._hand_info(arr, self._last_diag))
         return hands_out
 
     def close(self):
@@ -94,25 +196,38 @@ class OpenCVHandTracker:
     """Fallback tracker using HSV skin segmentation + contour/convex hull heuristics.
     Supports detecting up to two largest hand blobs and returns list of hand infos.
     """
-    def __init__(self):
+    def __init__(self, lower1=(0,20,70), upper1=(20,255,255), lower2=(170,20,70), upper2=(180,255,255)):
         # smoothing buffers per detected hand (we store a short history of results)
         self.history = deque(maxlen=6)
-
-    def _skin_mask(self, frame, lower1=(0,20,70), upper1=(20,255,255), lower2=(170,20,70), upper2=(180,255,255)):
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        lower1 = np.array(lower1, dtype=np.uint8)
-        upper1 = np.array(upper1, dtype=np.uint8)
-        lower2 = np.array(lower2, dtype=np.uint8)
-        upper2 = np.array(upper2, dtype=np.uint8)
-        m1 = cv2.inRange(hsv, lower1, upper1)
-        m2 = cv2.inRange(hsv, lower2, upper2)
-        mask = cv2.bitwise_or(m1, m2)
-        # morphological cleanup
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=2)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
-        mask = cv2.GaussianBlur(mask, (5, 5), 0)
-        return mask
+        # HSV skin ranges (red hue wraps around, hence two bands) and morphology kernel
+        self._lower1 = np.array(lower1, dtype=np.uint8)
+        self._upper1 = np.array(upper1, dtype=np.uint8)
+        self._lower2 = np.array(lower2, dtype=np.uint8)
+        self._upper2 = np.array(upper2, dtype=np.uint8)
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        # run the mask pipeline through OpenCV's transparent API (OpenCL) when a device is available
+        self._use_ocl = cv2.ocl.haveOpenCL()
+        if self._use_ocl:
+            cv2.ocl.setUseOpenCL(True)
+        # per-frame work buffers for the CPU path, (re)allocated only when the frame size changes
+        self._hsv = None
+        self._mask = None
+        self._mask2 = None
+
+    def _skin_mask(self, frame):
+        if not self._use_ocl and (self._hsv is None or self._hsv.shape != frame.shape):
+            self._hsv = np.empty_like(frame)
+            self._mask = np.empty(frame.shape[:2], dtype=np.uint8)
+            self._mask2 = np.empty(frame.shape[:2], dtype=np.uint8)
+        src = cv2.UMat(frame) if self._use_ocl else frame
+        hsv = cv2.cvtColor(src, cv2.COLOR_BGR2HSV, dst=self._hsv)
+        mask = cv2.inRange(hsv, self._lower1, self._upper1, dst=self._mask)
+        cv2.bitwise_or(mask, cv2.inRange(hsv, self._lower2, self._upper2, dst=self._mask2), dst=mask)
+        # morphological cleanup (in place); the mask is binary so no blur is needed before findContours
+        cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._kernel, dst=mask)
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel, dst=mask)
+        # findContours needs a host array
+        return mask.get() if self._use_ocl else mask
 
     def _extract_hand_info_from_contour(self, c, frame_shape):
         h, w = frame_shape
@@ -126,17 +241,19 @@ class OpenCVHandTracker:
             info['center'] = (w//2, h//2)
         # convex hull & topmost points as candidate fingertips
         hull = cv2.convexHull(c, returnPoints=True)
-        hull_pts = [tuple(pt[0]) for pt in hull]
-        hull_sorted = sorted(hull_pts, key=lambda p: p[1])
-        tips = []
-        for p in hull_sorted:
-            if not tips:
-                tips.append(p)
-            else:
-                if all(np.hypot(p[0]-q[0], p[1]-q[1]) > 25 for q in tips):
-                    tips.append(p)
-            if len(tips) >= 5:
-                break
+        hp = hull.reshape(-1, 2).astype(np.int32)
+        hp = hp[np.argsort(hp[:, 1], kind='stable')]
+        # pairwise squared distances between hull points, computed once
+        diff = hp[:, None, :] - hp[None, :, :]
+        d2 = (diff * diff).sum(axis=2)
+        # greedily keep the topmost points that are more than 25px from every point kept so far
+        chosen = []
+        for i in range(len(hp)):
+            if not chosen or d2[i, chosen].min() > TIP_MIN_DIST_SQ:
+                chosen.append(i)
+                if len(chosen) >= 5:
+                    break
+        tips = [tuple(p) for p in hp[chosen].tolist()]
         info['fingertips'] = tips
         if len(tips) >= 2:
             # identify leftmost and rightmost among the top 3 as thumb/index heuristic
@@ -152,17 +269,17 @@ class OpenCVHandTracker:
     def process(self, frame):
         h, w, _ = frame.shape
         mask = self._skin_mask(frame)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # TC89_KCOS returns simplified contours, which keeps convexHull cheap downstream
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
         hands_out = []
         if not contours:
             return hands_out
-        # choose up to 2 largest contours (candidate hands)
-        contours_sorted = sorted(contours, key=lambda c: cv2.contourArea(c), reverse=True)
-        for c in contours_sorted[:2]:
-            area = cv2.contourArea(c)
+        # choose up to 2 largest contours (candidate hands) without sorting all of them
+        scored = heapq.nlargest(2, ((cv2.contourArea(c), i) for i, c in enumerate(contours)))
+        for area, i in scored:
             if area < 2000:  # tuned min area to be smaller for more sensitivity
-                continue
-            info = self._extract_hand_info_from_contour(c, (h, w))
+                break
+            info = self._extract_hand_info_from_contour(contours[i], (h, w))
             hands_out.append(info)
         # smoothing history: keep recent lists
         self.history.append(hands_out)
@@ -170,43 +287,132 @@ class OpenCVHandTracker:
         return hands_out
 
 
+class LatestFrame:
+    """Single-slot holder for the newest camera frame.
+    The capture thread overwrites the slot; the consumer blocks until a frame arrives
+    and takes whatever is newest, so stale frames are dropped instead of queueing up
+    behind slow processing.
+    """
+    def __init__(self):
+        self._frame = None
+        self._cond = threading.Condition()
+        self.failed = False
+
+    def set(self, frame):
+        with self._cond:
+            self._frame = frame
+            self._cond.notify()
+
+    def fail(self):
+        # wake the consumer so it can see the camera is gone
+        with self._cond:
+            self.failed = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        # take ownership of the newest frame, waiting up to `timeout` seconds for one;
+        # None on timeout or after fail()
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame is not None or self.failed, timeout)
+            frame = self._frame
+            self._frame = None
+        return frame
+
+
+def capture_worker(cap, latest, stop_event):
+    while not stop_event.is_set():
+        ok, frame = cap.read()
+        if not ok:
+            latest.fail()
+            break
+        latest.set(frame)
 
-def draw_overlay(frame, hands, trails=None, backend_name='fallback'):
-    h, w, _ = frame.shape
+
+def put_latest(q, item):
+    # maxsize=1 queue that drops the stale item instead of blocking the producer
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+
+def inference_worker(tracker, latest, results, stop_event, use_mediapipe):
+    # Runs the tracker on its own thread so inference on frame N overlaps capture of N+1
+    # and rendering of N-1; posts (flipped frame, hands) for the main thread.
+    detect_scale = None
+    disp_size = None
+    frame_idx = 0
+    while not stop_event.is_set():
+        # block until the capture thread posts a frame; the timeout only bounds shutdown latency
+        frame = latest.get(timeout=0.1)
+        if frame is None:
+            if latest.failed:
+                break
+            continue
+        frame = cv2.flip(frame, 1)
+        if detect_scale is None:
+            # camera resolution is fixed for the session, so read the frame size once
+            h, w = frame.shape[:2]
+            disp_size = (w, h)
+            # the OpenCV fallback's area/spacing thresholds are in full-res pixels, so only MediaPipe downscales
+            detect_scale = min(1.0, DETECT_LONG_EDGE / max(h, w)) if use_mediapipe else 1.0
+        phase = frame_idx % DETECT_EVERY if use_mediapipe else 0
+        frame_idx += 1
+        if phase:
+            hands = tracker.predict(phase / DETECT_EVERY)
+        elif detect_scale < 1.0:
+            # detect on a small copy; landmarks are mapped back to display resolution
+            small = cv2.resize(frame, None, fx=detect_scale, fy=detect_scale, interpolation=cv2.INTER_AREA)
+            hands = tracker.process(small, disp_size=disp_size)
+        elif use_mediapipe:
+            hands = tracker.process(frame, disp_size=disp_size)
+        else:
+            hands = tracker.process(frame)
+        put_latest(results, (frame, hands))
+
+
+# BGR fingertip colors per hand side
+FINGER_COLORS_RIGHT = {
+    'index': (0, 0, 255),       # red
+    'middle': (255, 0, 0),      # blue
+    'ring': (0, 165, 255),      # orange
+    'pinky': (0, 255, 0),       # green
+    'thumb': (255, 0, 255),     # pink
+}
+FINGER_COLORS_LEFT = {
+    'index': (240, 32, 160),    # purple
+    'middle': (0, 0, 0),        # black
+    'ring': (42, 42, 128),      # brown-ish
+    'pinky': (0, 255, 255),     # yellow
+    'thumb': (255, 0, 255),     # pink
+}
+FINGER_LABELS = {name: name[0].upper() for name in FINGER_COLORS_RIGHT}
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def draw_overlay(frame, hands, trails=None, backend_name='fallback', *, frame_h=None):
+    # frame_h: display frame height cached by the caller (read from frame.shape if omitted)
+    h = frame.shape[0] if frame_h is None else frame_h
     if hands is None:
         return frame
-    # BGR colors per hand
-    finger_colors_right = {
-        'index': (0, 0, 255),       # red
-        'middle': (255, 0, 0),      # blue
-        'ring': (0, 165, 255),      # orange
-        'pinky': (0, 255, 0),       # green
-        'thumb': (255, 0, 255),     # pink
-    }
-    finger_colors_left = {
-        'index': (240, 32, 160),    # purple
-        'middle': (0, 0, 0),        # black
-        'ring': (42, 42, 128),      # brown-ish
-        'pinky': (0, 255, 255),     # yellow
-        'thumb': (255, 0, 255),     # pink
-    }
-    # draw each hand
+    # draw each hand (trackers emit points as int tuples, so they go straight to cv2)
     for hi, info in enumerate(hands):
         color_center = (0, 200, 0) if hi == 0 else (0, 150, 255)
         if info.get('center'):
-            cv2.circle(frame, tuple(info['center']), 8, color_center, 2)
+            cv2.circle(frame, info['center'], 8, color_center, 2)
         # draw fingertips with per-finger colors
         if info.get('fingertips_named'):
-            palette = finger_colors_right if info.get('side') == 'right' else finger_colors_left
+            palette = FINGER_COLORS_RIGHT if info.get('side') == 'right' else FINGER_COLORS_LEFT
             for name, tip in info['fingertips_named'].items():
-                cv2.circle(frame, tuple(tip), 7, palette.get(name, (0, 200, 255)), -1)
-                cv2.putText(frame, name[0].upper(), (tip[0]+6, tip[1]-6), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255,255,255), 1)
+                cv2.circle(frame, tip, 7, palette.get(name, (0, 200, 255)), -1)
+                cv2.putText(frame, FINGER_LABELS[name], (tip[0]+6, tip[1]-6), FONT, 0.5, (255,255,255), 1)
         else:
             for tip in info.get('fingertips', []) or []:
-                cv2.circle(frame, tuple(tip), 6, (0, 200, 255), -1)
+                cv2.circle(frame, tip, 6, (0, 200, 255), -1)
         if info.get('pinch_finger'):
-            cv2.putText(frame, f"Pinch:{info['pinch_finger']}", (10, 25 + 18*hi), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0,255,255), 2)
-    cv2.putText(frame, f"Backend: {backend_name} | Hands: {len(hands)}", (10, frame.shape[0]-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (230,230,230), 1)
+            cv2.putText(frame, f"Pinch:{info['pinch_finger']}", (10, 25 + 18*hi), FONT, 0.55, (0,255,255), 2)
+    cv2.putText(frame, f"Backend: {backend_name} | Hands: {len(hands)}", (10, h-10), FONT, 0.5, (230,230,230), 1)
     return frame
 
 
@@ -226,6 +432,13 @@ def main():
     if not cap.isOpened():
         print("Error: could not open camera (0). Try another camera index or check permissions.")
         return
+    # keep the driver queue shallow so we always process the newest frame
+    if cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("Camera buffer size set to 1")
+    else:
+        print("Warning: camera backend ignored CAP_PROP_BUFFERSIZE (frames may lag)")
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FPS, 30)
 
     fps_time = time.time()
     frame_count = 0
@@ -235,25 +448,37 @@ def main():
     csv_logging = False
     csv_file = None
     csv_writer = None
+    csv_buf = []  # rows waiting to be written in one batch
+    csv_last_flush = 0.0
     websocket_enabled = False
 
     # helper functions for CSV
     def start_csv():
-        nonlocal csv_logging, csv_file, csv_writer
+        nonlocal csv_logging, csv_file, csv_writer, csv_last_flush
         if csv_logging:
             return
-        csv_file = open('hand_log.csv', 'a', newline='')
+        csv_file = open('hand_log.csv', 'a', newline='', buffering=1 << 16)
         csv_writer = csv.writer(csv_file)
         csv_logging = True
+        csv_last_flush = _time.time()
         csv_writer.writerow(['timestamp', 'frame', 'hand_id', 'label', 'x_norm', 'y_norm', 'distance_norm'])
         print("CSV logging started -> hand_log.csv")
 
+    def flush_csv():
+        nonlocal csv_last_flush
+        if csv_buf:
+            csv_writer.writerows(csv_buf)
+            csv_buf.clear()
+            csv_file.flush()
+        csv_last_flush = _time.time()
+
     def stop_csv():
         nonlocal csv_logging, csv_file, csv_writer
         if not csv_logging:
             return
         csv_logging = False
         try:
+            flush_csv()
             csv_file.close()
             print("CSV logging stopped")
         except Exception:
@@ -261,22 +486,13 @@ def main():
 
     # simple websocket streamer if available
     ws_clients = set()
-    broadcast_queue = []  # Simple list to queue messages for async broadcast
+    ws_loop = None  # event loop of the server thread; broadcasts are scheduled onto it
 
     async def ws_handler(websocket):
+        # Only track membership; messages are fanned out by websockets.broadcast
         ws_clients.add(websocket)
         try:
-            # Receive messages (if any) and send queued broadcasts
-            while True:
-                # Check for queued broadcast messages and send them
-                while broadcast_queue:
-                    msg = broadcast_queue.pop(0)
-                    try:
-                        await websocket.send(msg)
-                    except Exception:
-                        pass
-                # Brief delay to allow other tasks to run
-                await asyncio.sleep(0.001)
+            await websocket.wait_closed()
         finally:
             ws_clients.discard(websocket)
 
@@ -287,9 +503,17 @@ def main():
             return
         if websocket_enabled:
             return
+        if ws_loop is not None:
+            # stop_ws_server() only pauses streaming; the server thread still owns the port
+            websocket_enabled = True
+            print("WebSocket streaming resumed")
+            return
         
         async def main_loop():
+            nonlocal ws_loop
             async with websockets.serve(ws_handler, '0.0.0.0', port):
+                # publish the loop only once the port is bound, so broadcasts never target a dead loop
+                ws_loop = asyncio.get_running_loop()
                 print(f"WebSocket server started on ws://localhost:{port}")
                 await asyncio.Future()  # run forever
         
@@ -314,47 +538,62 @@ def main():
         except Exception:
             print("Warning: failed to start WebSocket server automatically")
 
+    # grab frames on a dedicated thread so the driver buffer never backs up
+    latest = LatestFrame()
+    stop_event = threading.Event()
+    cap_thread = threading.Thread(target=capture_worker, args=(cap, latest, stop_event), daemon=True)
+    cap_thread.start()
+    # tracker runs on a second thread; the main loop only normalizes, draws and streams
+    results = queue.Queue(maxsize=1)
+    infer_thread = threading.Thread(target=inference_worker,
+                                    args=(tracker, latest, results, stop_event, backend == 'MediaPipe'),
+                                    daemon=True)
+    infer_thread.start()
+
+    # frame-size derived scale factors, filled in once the first frame arrives
+    inv_w = inv_h = inv_diag = None
+    half_w = None
+
     try:
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("Failed to read frame from camera")
-                break
-            frame = cv2.flip(frame, 1)
-            hands = tracker.process(frame)
+            try:
+                frame, hands = results.get(timeout=0.01)
+            except queue.Empty:
+                if not infer_thread.is_alive():
+                    if latest.failed:
+                        print("Failed to read frame from camera")
+                    break
+                continue
+            if inv_diag is None:
+                h, w = frame.shape[:2]
+                inv_w, inv_h = 1.0 / w, 1.0 / h
+                inv_diag = 1.0 / math.hypot(w, h)
+                half_w = w / 2
 
             # compute normalized positions for console reporting and streaming
-            h, w, _ = frame.shape
-            diag = (w*w + h*h) ** 0.5
             norm_hands = []
             for hi, info in enumerate(hands):
-                ninfo = dict(info)
+                # trackers build new dicts every call and never read returned ones back
+                # (predict() rebuilds from landmark arrays), so annotate in place instead of copying
+                ninfo = info
                 if info.get('index_tip'):
                     ix, iy = info['index_tip']
-                    ninfo['index_norm'] = (ix / w, iy / h)
+                    ninfo['index_norm'] = (ix * inv_w, iy * inv_h)
                 if info.get('thumb_tip'):
                     tx, ty = info['thumb_tip']
-                    ninfo['thumb_norm'] = (tx / w, ty / h)
+                    ninfo['thumb_norm'] = (tx * inv_w, ty * inv_h)
                 # distances to thumb for each finger
                 thumb_pt = info.get('thumb_tip')
                 finger_min = None
-                if thumb_pt and info.get('fingertips_named'):
-                    dist_map = {}
-                    for fname, pt in info['fingertips_named'].items():
-                        if fname == 'thumb':
-                            continue
-                        dx = pt[0] - thumb_pt[0]
-                        dy = pt[1] - thumb_pt[1]
-                        dist = float((dx*dx + dy*dy) ** 0.5)
-                        dist_map[fname] = dist / diag
+                if thumb_pt and info.get('finger_dists') is not None:
+                    dist_map = dict(zip(PINCH_FINGERS, (info['finger_dists'] * inv_diag).tolist()))
                     ninfo['finger_dist_norm'] = dist_map
                     # choose closest finger below threshold
-                    pinch_thresh = 0.05
                     if dist_map:
-                        f_sorted = sorted(dist_map.items(), key=lambda kv: kv[1])
-                        if f_sorted[0][1] < pinch_thresh:
-                            finger_min = f_sorted[0][0]
-                ninfo['distance_norm'] = info.get('distance_index_thumb', 0.0) / diag
+                        name_min, d_min = min(dist_map.items(), key=lambda kv: kv[1])
+                        if d_min < PINCH_THRESH:
+                            finger_min = name_min
+                ninfo['distance_norm'] = info.get('distance_index_thumb', 0.0) * inv_diag
                 # Copy hand_size_norm if available (for zoom control)
                 if 'hand_size_norm' in info:
                     ninfo['hand_size_norm'] = info['hand_size_norm']
@@ -365,7 +604,7 @@ def main():
                 # approximate left/right hand based on center x position (frame already flipped)
                 if info.get('center'):
                     cx, cy = info['center']
-                    ninfo['side'] = 'left' if cx < (w/2) else 'right'
+                    ninfo['side'] = 'left' if cx < half_w else 'right'
                 else:
                     ninfo['side'] = None
                 norm_hands.append(ninfo)
@@ -379,8 +618,8 @@ def main():
                 print(f"FPS: {frame_count} | Hands: {len(norm_hands)} {' '.join(summary)}")
                 frame_count = 0
                 fps_time = time.time()
-            # draw and show
-            out = draw_overlay(frame.copy(), norm_hands, backend_name=backend)
+            # draw and show (frame is not reused after display, so draw on it directly)
+            out = draw_overlay(frame, norm_hands, backend_name=backend, frame_h=h)
             cv2.imshow('Hand & Finger Tracking', out)
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q') or key == 27:
@@ -402,35 +641,43 @@ def main():
                     stop_ws_server()
 
             # streaming and logging
-            if csv_logging and norm_hands:
+            if csv_logging:
                 ts = _time.time()
                 for hi, hinfo in enumerate(norm_hands):
                     for label in ('index', 'thumb'):
                         keypos = f"{label}_norm"
                         if keypos in hinfo:
                             x, y = hinfo[keypos]
-                            csv_writer.writerow([ts, frame_count, hi, label, x, y, hinfo.get('distance_norm', 0.0)])
+                            csv_buf.append((ts, frame_count, hi, label, x, y, hinfo.get('distance_norm', 0.0)))
+                # write rows in batches rather than one syscall-prone writerow per keypoint;
+                # checked every frame so buffered rows still land while no hand is visible
+                if len(csv_buf) >= 64 or ts - csv_last_flush > 1.0:
+                    flush_csv()
             # streaming to websocket clients
-            if websocket_enabled and HAS_WEBSOCKETS and ws_clients:
+            if websocket_enabled and HAS_WEBSOCKETS and ws_clients and ws_loop is not None:
                 payload = {'t': _time.time(), 'hands': []}
                 for hi, hinfo in enumerate(norm_hands):
-                    payload['hands'].append({
-                        'hand_id': hi,
-                        'index': hinfo.get('index_norm'),
-                        'thumb': hinfo.get('thumb_norm'),
-                        'distance_norm': hinfo.get('distance_norm'),
-                        'side': hinfo.get('side'),
-                        'pinch_finger': hinfo.get('pinch_finger'),
-                        'pinch_distance_norm': hinfo.get('pinch_distance_norm'),
-                        'finger_dist_norm': hinfo.get('finger_dist_norm', {}),
-                        'hand_size_norm': hinfo.get('hand_size_norm', 0.0)
-                    })
-                # Queue message for async broadcast
-                msg = json.dumps(payload)
-                broadcast_queue.append(msg)
+                    # keys with no value are left out rather than sent as null
+                    payload['hands'].append({k: v for k, v in (
+                        ('hand_id', hi),
+                        ('index', hinfo.get('index_norm')),
+                        ('thumb', hinfo.get('thumb_norm')),
+                        ('distance_norm', hinfo.get('distance_norm')),
+                        ('side', hinfo.get('side')),
+                        ('pinch_finger', hinfo.get('pinch_finger')),
+                        ('pinch_distance_norm', hinfo.get('pinch_distance_norm')),
+                        ('finger_dist_norm', hinfo.get('finger_dist_norm', {})),
+                        ('hand_size_norm', hinfo.get('hand_size_norm', 0.0)),
+                    ) if v is not None})
+                # Hand off to the server loop; broadcast writes once per client without blocking
+                msg = dumps(payload)
+                ws_loop.call_soon_threadsafe(websockets.broadcast, ws_clients, msg)
     except KeyboardInterrupt:
         pass
     finally:
+        stop_event.set()
+        infer_thread.join(timeout=1.0)
+        cap_thread.join(timeout=1.0)
         if HAS_MEDIAPIPE:
             tracker.close()
         stop_csv()